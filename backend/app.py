@@ -1,9 +1,16 @@
 import os
+import functools
+import io
+import json
+import shutil
+import subprocess
 import uuid
 import zipfile
 import rarfile
 import tempfile
-from flask import Flask, request, jsonify, send_file, send_from_directory
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from celery import Celery
@@ -22,15 +29,20 @@ celery = Celery(
     broker=app.config['CELERY_BROKER_URL'],
     backend=app.config['CELERY_RESULT_BACKEND']
 )
-celery.conf.update(app.config)
+# Broker and backend URLs are passed above; only new-style (lowercase) settings
+# are applied, since Celery refuses to mix them with old uppercase keys
+celery.conf.update(config.CELERY_CONNECTION_SETTINGS)
 
 # Import tasks after Celery is initialized
 from tasks import render_blend_file
 
 
+ALLOWED_EXTENSIONS = frozenset(app.config['ALLOWED_EXTENSIONS'])
+
+
 def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    _, dot, ext = filename.rpartition('.')
+    return bool(dot) and ext.lower() in ALLOWED_EXTENSIONS
 
 
 @app.route('/')
@@ -60,6 +72,272 @@ def health_check():
     return jsonify({'status': 'healthy', 'message': 'Blender Render API is running'})
 
 
+def copy_file(src, dst):
+    """
+    Copy an open source file to an open destination file. Uses
+    copy_file_range(2) so data stays in the kernel (or is reflinked on
+    btrfs/XFS), falling back to a large-buffer userspace copy.
+    """
+    # fileno() on an in-memory SpooledTemporaryFile would roll it over to disk
+    if hasattr(os, 'copy_file_range') and getattr(src, '_rolled', True):
+        start = src_offset = None
+        try:
+            src_fd, dst_fd = src.fileno(), dst.fileno()
+            start = src_offset = src.tell()
+            dst.flush()
+            while copied := os.copy_file_range(src_fd, dst_fd, config.STREAM_CHUNK_SIZE * 64,
+                                               offset_src=src_offset):
+                src_offset += copied
+            return
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # Source without a real fd, or unsupported by the kernel/filesystem.
+            # Only safe to fall back if nothing has been copied yet.
+            if src_offset != start:
+                raise
+
+    shutil.copyfileobj(src, dst, config.STREAM_CHUNK_SIZE)
+
+
+def save_upload(file, filepath):
+    """Save a multipart upload, copying from Werkzeug's spooled temp file in-kernel"""
+    file.stream.seek(0)
+    with open(filepath, 'wb') as dst:
+        copy_file(file.stream, dst)
+
+
+def parse_render_params(params):
+    """Read render parameters from a form or query-string mapping"""
+    return {
+        'output_format': params.get('format', 'PNG'),
+        'samples': int(params.get('samples', config.DEFAULT_SAMPLES)),
+        'resolution_x': int(params.get('resolution_x', config.DEFAULT_RESOLUTION_X)),
+        'resolution_y': int(params.get('resolution_y', config.DEFAULT_RESOLUTION_Y)),
+        'frame_start': params.get('frame_start'),
+        'frame_end': params.get('frame_end')
+    }
+
+
+def find_blend_file(extract_dir):
+    """Return the first .blend file found under extract_dir, or None"""
+    # Stops at the first hit instead of walking the whole archive
+    stack = [extract_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                # Only regular files: a symlinked .blend could point anywhere
+                elif entry.name.endswith('.blend') and entry.is_file(follow_symlinks=False):
+                    return entry.path
+
+    return None
+
+
+def remove_special_files(extract_dir):
+    """
+    Delete the symlinks, device nodes and FIFOs bsdtar can restore, so a render
+    can only read files that were actually uploaded.
+    """
+    stack = [extract_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif not entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
+
+
+def stream_extract(stream, job_id):
+    """
+    Pipe an archive from the request body straight into bsdtar, so extraction
+    overlaps with the upload and the archive itself is never written to disk.
+    Returns (blend_filepath, error_response).
+    """
+    extract_dir = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_extracted")
+    os.makedirs(extract_dir, exist_ok=True)
+
+    blend_filepath = None
+    try:
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                # As root bsdtar would restore owners, setuid bits, ACLs and
+                # xattrs from the archive; zipfile and rarfile never did
+                [config.BSDTAR_PATH, '-x', '--no-same-owner', '--no-same-permissions',
+                 '-f', '-', '-C', extract_dir],
+                stdin=subprocess.PIPE,
+                stderr=stderr
+            )
+            try:
+                try:
+                    while chunk := stream.read(config.STREAM_CHUNK_SIZE):
+                        process.stdin.write(chunk)
+                    process.stdin.close()
+                except BrokenPipeError:
+                    # bsdtar exited early (bad archive), the return code tells us why
+                    pass
+                process.wait()
+            finally:
+                if process.returncode is None:
+                    # Client disconnected or the read failed: stop bsdtar
+                    # instead of leaving it blocked on stdin
+                    process.kill()
+                    process.wait()
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    # Unflushed data is discarded, the fd is still closed
+                    pass
+
+            if process.returncode != 0:
+                stderr.seek(0)
+                message = stderr.read().decode(errors='replace').strip()
+                return None, (jsonify({'error': f'Error extracting archive: {message}'}), 400)
+
+        remove_special_files(extract_dir)
+        blend_filepath = find_blend_file(extract_dir)
+        if not blend_filepath:
+            return None, (jsonify({'error': 'No .blend file found in archive'}), 400)
+
+        return blend_filepath, None
+    finally:
+        if blend_filepath is None:
+            # Don't leave a partial extraction behind
+            shutil.rmtree(extract_dir, ignore_errors=True)
+
+
+def zip_member_path(extract_dir, name):
+    """Target path for an archive member, sanitized the way ZipFile.extract does"""
+    arcname = name.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    # Drop drive letters, absolute roots and '..' so members stay in extract_dir
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid = ('', os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(part for part in arcname.split(os.path.sep)
+                               if part not in invalid)
+    return os.path.join(extract_dir, arcname)
+
+
+def extract_zip_members(filepath, members):
+    """
+    Write the given (name, target_path) members using this thread's own
+    ZipFile handle. Parent directories must already exist.
+    """
+    # A large read buffer batches zipfile's small member reads
+    with open(filepath, 'rb', buffering=config.STREAM_CHUNK_SIZE) as archive, \
+            zipfile.ZipFile(archive, 'r') as zip_ref:
+        for name, target in members:
+            with zip_ref.open(name) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, config.STREAM_CHUNK_SIZE)
+
+
+def extract_zip(filepath, extract_dir):
+    """
+    Extract a ZIP archive, inflating members in parallel for large archives.
+    zlib releases the GIL while inflating, so threads use multiple cores.
+    """
+    with zipfile.ZipFile(filepath, 'r') as zip_ref:
+        members = zip_ref.infolist()
+
+    # Create every directory up front on this thread, so workers never race
+    # each other on a shared parent
+    infos = []
+    directories = {extract_dir}
+    for info in members:
+        target = zip_member_path(extract_dir, info.filename)
+        if info.is_dir():
+            directories.add(target)
+        elif target != extract_dir:
+            directories.add(os.path.dirname(target))
+            infos.append((info, target))
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    workers = min(os.cpu_count() or 1, len(infos))
+    total_size = sum(info.file_size for info, _ in infos)
+    if workers < 2 or total_size < config.PARALLEL_EXTRACT_MIN_SIZE:
+        extract_zip_members(filepath, [(info.filename, target) for info, target in infos])
+        return
+
+    # Spread files across workers, largest first, to balance the work
+    batches = [[] for _ in range(workers)]
+    batch_sizes = [0] * workers
+    for info, target in sorted(infos, key=lambda member: member[0].file_size, reverse=True):
+        smallest = batch_sizes.index(min(batch_sizes))
+        batches[smallest].append((info.filename, target))
+        batch_sizes[smallest] += info.file_size
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(extract_zip_members, filepath, batch)
+                   for batch in batches]
+        for future in futures:
+            future.result()
+
+
+def prepare_blend_file(filepath, filename, job_id):
+    """
+    Extract ZIP/RAR uploads and locate the .blend file to render.
+    Returns (blend_filepath, error_response).
+    """
+    if not (filename.lower().endswith('.zip') or filename.lower().endswith('.rar')):
+        return filepath, None
+
+    extract_dir = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_extracted")
+    os.makedirs(extract_dir, exist_ok=True)
+
+    try:
+        # Handle ZIP files
+        if filename.lower().endswith('.zip'):
+            extract_zip(filepath, extract_dir)
+        # Handle RAR files
+        elif filename.lower().endswith('.rar'):
+            with rarfile.RarFile(filepath, 'r') as rar_ref:
+                rar_ref.extractall(extract_dir)
+
+        # Find the .blend file in the extracted contents
+        blend_filepath = find_blend_file(extract_dir)
+
+        if not blend_filepath:
+            return None, (jsonify({'error': 'No .blend file found in archive'}), 400)
+
+        # Clean up the uploaded archive file
+        os.remove(filepath)
+
+        return blend_filepath, None
+
+    except zipfile.BadZipFile:
+        return None, (jsonify({'error': 'Invalid ZIP file'}), 400)
+    except rarfile.Error:
+        return None, (jsonify({'error': 'Invalid RAR file'}), 400)
+    except Exception as e:
+        return None, (jsonify({'error': f'Error extracting archive: {str(e)}'}), 500)
+
+
+def queue_render(blend_filepath, job_id, params):
+    """Queue the render task and build the API response"""
+    frame_start = params['frame_start']
+    frame_end = params['frame_end']
+
+    task = render_blend_file.apply_async(
+        args=[blend_filepath, job_id, params['output_format']],
+        kwargs={
+            'samples': params['samples'],
+            'resolution_x': params['resolution_x'],
+            'resolution_y': params['resolution_y'],
+            'frame_start': int(frame_start) if frame_start else None,
+            'frame_end': int(frame_end) if frame_end else None
+        }
+    )
+
+    return jsonify({
+        'job_id': job_id,
+        'task_id': task.id,
+        'message': 'Render job queued successfully',
+        'status': 'queued'
+    }), 202
+
+
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
     """Handle .blend file upload and initiate rendering"""
@@ -75,14 +353,9 @@ def upload_file():
         return jsonify({'error': 'Invalid file type. Only .blend, .zip, and .rar files are allowed'}), 400
 
     # Get render parameters from request
-    output_format = request.form.get('format', 'PNG')
-    samples = int(request.form.get('samples', config.DEFAULT_SAMPLES))
-    resolution_x = int(request.form.get('resolution_x', config.DEFAULT_RESOLUTION_X))
-    resolution_y = int(request.form.get('resolution_y', config.DEFAULT_RESOLUTION_Y))
-    frame_start = request.form.get('frame_start')
-    frame_end = request.form.get('frame_end')
-
-    if output_format not in config.SUPPORTED_FORMATS:
+    params = parse_render_params(request.form)
+
+    if params['output_format'] not in config.SUPPORTED_FORMATS:
         return jsonify({'error': f'Unsupported format. Supported: {config.SUPPORTED_FORMATS}'}), 400
 
     # Generate unique job ID
@@ -91,65 +364,77 @@ def upload_file():
     # Save uploaded file
     filename = secure_filename(file.filename)
     filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_{filename}")
-    file.save(filepath)
-    
+    save_upload(file, filepath)
+
     # Handle ZIP/RAR files - extract them
-    blend_filepath = filepath
-    if filename.lower().endswith('.zip') or filename.lower().endswith('.rar'):
-        extract_dir = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_extracted")
-        os.makedirs(extract_dir, exist_ok=True)
-        
+    blend_filepath, error = prepare_blend_file(filepath, filename, job_id)
+    if error:
+        return error
+
+    return queue_render(blend_filepath, job_id, params)
+
+
+@app.route('/api/upload_stream', methods=['POST'])
+def upload_stream():
+    """
+    Handle a raw (application/octet-stream) upload and initiate rendering.
+    The request body is the file itself; the filename and render parameters
+    are passed as query-string args, so no multipart/form parsing runs.
+    """
+    filename = secure_filename(request.args.get('filename', ''))
+
+    if filename == '':
+        return jsonify({'error': 'No filename given'}), 400
+
+    if not allowed_file(filename):
+        return jsonify({'error': 'Invalid file type. Only .blend, .zip, and .rar files are allowed'}), 400
+
+    # Get render parameters from query string
+    params = parse_render_params(request.args)
+
+    if params['output_format'] not in config.SUPPORTED_FORMATS:
+        return jsonify({'error': f'Unsupported format. Supported: {config.SUPPORTED_FORMATS}'}), 400
+
+    # Generate unique job ID
+    job_id = str(uuid.uuid4())
+
+    # Archives are extracted while they are still being received
+    is_archive = filename.lower().endswith('.zip') or filename.lower().endswith('.rar')
+    if is_archive and shutil.which(config.BSDTAR_PATH):
+        blend_filepath, error = stream_extract(request.stream, job_id)
+        if error:
+            return error
+
+        return queue_render(blend_filepath, job_id, params)
+
+    # Copy the request body straight to disk in large chunks
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_{filename}")
+    stream = request.stream
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
         try:
-            # Handle ZIP files
-            if filename.lower().endswith('.zip'):
-                with zipfile.ZipFile(filepath, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
-            # Handle RAR files
-            elif filename.lower().endswith('.rar'):
-                with rarfile.RarFile(filepath, 'r') as rar_ref:
-                    rar_ref.extractall(extract_dir)
-            
-            # Find the .blend file in the extracted contents
-            blend_files = []
-            for root, dirs, files in os.walk(extract_dir):
-                for f in files:
-                    if f.endswith('.blend'):
-                        blend_files.append(os.path.join(root, f))
-            
-            if not blend_files:
-                return jsonify({'error': 'No .blend file found in archive'}), 400
-            
-            # Use the first .blend file found
-            blend_filepath = blend_files[0]
-            
-            # Clean up the uploaded archive file
-            os.remove(filepath)
-            
-        except zipfile.BadZipFile:
-            return jsonify({'error': 'Invalid ZIP file'}), 400
-        except rarfile.Error:
-            return jsonify({'error': 'Invalid RAR file'}), 400
-        except Exception as e:
-            return jsonify({'error': f'Error extracting archive: {str(e)}'}), 500
-
-    # Queue render task
-    task = render_blend_file.apply_async(
-        args=[blend_filepath, job_id, output_format],
-        kwargs={
-            'samples': samples,
-            'resolution_x': resolution_x,
-            'resolution_y': resolution_y,
-            'frame_start': int(frame_start) if frame_start else None,
-            'frame_end': int(frame_end) if frame_end else None
-        }
-    )
+            while chunk := stream.read(config.STREAM_CHUNK_SIZE):
+                view = memoryview(chunk)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+        finally:
+            os.close(fd)
+    except BaseException:
+        # Client disconnected or the body was too large: don't keep the partial file
+        os.remove(filepath)
+        raise
+
+    if os.path.getsize(filepath) == 0:
+        os.remove(filepath)
+        return jsonify({'error': 'Empty request body'}), 400
 
-    return jsonify({
-        'job_id': job_id,
-        'task_id': task.id,
-        'message': 'Render job queued successfully',
-        'status': 'queued'
-    }), 202
+    # Handle ZIP/RAR files - extract them
+    blend_filepath, error = prepare_blend_file(filepath, filename, job_id)
+    if error:
+        return error
+
+    return queue_render(blend_filepath, job_id, params)
 
 
 @app.route('/api/status/<task_id>', methods=['GET'])
@@ -187,61 +472,194 @@ def get_status(task_id):
     return jsonify(response)
 
 
+def drop_page_cache(fd):
+    """
+    Tell the kernel a file's cached pages are no longer needed, so large
+    downloaded frames do not push textures for the next render out of cache.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def drop_file_cache(filepath):
+    """drop_page_cache() for a path, once the response has been sent"""
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        drop_page_cache(fd)
+    finally:
+        os.close(fd)
+
+
+def call_on_body_close(response, func):
+    """
+    Run func once the server has finished sending a send_file() response.
+    send_file() marks the response direct_passthrough, so its file wrapper is
+    handed to the server as-is and response.call_on_close() hooks never run.
+    """
+    body = response.response
+    close = body.close
+
+    def close_and_run():
+        try:
+            close()
+        finally:
+            func()
+
+    body.close = close_and_run
+
+
+# Rendered outputs are already compressed, deflating them only costs CPU
+STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.exr', '.mp4'}
+
+
+class ZipStreamBuffer:
+    """Write-only file object that collects ZipFile output between yields"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def zip_stream(render_dir, files):
+    """
+    Generate a zip archive of files chunk by chunk, so it is sent while it
+    is being built instead of being held in memory.
+    """
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for file in files:
+            filepath = os.path.join(render_dir, file)
+            zinfo = zipfile.ZipInfo.from_file(filepath, file)
+            if os.path.splitext(file)[1].lower() in STORED_EXTENSIONS:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+
+            with open(filepath, 'rb') as src, zf.open(zinfo, 'w') as dest:
+                while chunk := src.read(config.STREAM_CHUNK_SIZE):
+                    dest.write(chunk)
+                    yield buffer.pop()
+                drop_page_cache(src.fileno())
+
+            yield buffer.pop()
+
+    # Central directory
+    yield buffer.pop()
+
+
 @app.route('/api/download/<job_id>', methods=['GET'])
 def download_file(job_id):
     """Download rendered output"""
     render_dir = os.path.join(app.config['RENDER_FOLDER'], job_id)
 
-    if not os.path.exists(render_dir):
-        return jsonify({'error': 'Render not found'}), 404
-
     # Find the output file(s)
-    files = [f for f in os.listdir(render_dir) if not f.startswith('.')]
+    try:
+        with os.scandir(render_dir) as entries:
+            files = [entry.name for entry in entries if not entry.name.startswith('.')]
+    except (FileNotFoundError, NotADirectoryError):
+        return jsonify({'error': 'Render not found'}), 404
 
     if not files:
         return jsonify({'error': 'No output files found'}), 404
 
     # If single file, send it directly
     if len(files) == 1:
+        # Behind nginx, hand the transfer off so it is served with sendfile(2)
+        if app.config['X_ACCEL_REDIRECT_PREFIX']:
+            response = Response(headers={
+                'X-Accel-Redirect': f"{app.config['X_ACCEL_REDIRECT_PREFIX'].rstrip('/')}/{job_id}/{files[0]}",
+                'Content-Disposition': f'attachment; filename={files[0]}'
+            })
+            # Let nginx pick the type from the file extension
+            del response.headers['Content-Type']
+            return response
+
+        # Passing the path lets the WSGI server's file_wrapper use sendfile(2)
         filepath = os.path.join(render_dir, files[0])
-        return send_file(filepath, as_attachment=True)
+        response = send_file(filepath, as_attachment=True, conditional=True)
+        if not app.config['USE_X_SENDFILE']:
+            # With X-Sendfile the front-end server is still reading the file
+            call_on_body_close(response, lambda: drop_file_cache(filepath))
+        return response
+
+    # If multiple files (animation frames), stream them as a zip
+    return Response(
+        stream_with_context(zip_stream(render_dir, files)),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename={job_id}_render.zip'}
+    )
 
-    # If multiple files (animation frames), create a zip
-    import zipfile
-    from io import BytesIO
 
-    memory_file = BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for file in files:
-            filepath = os.path.join(render_dir, file)
-            zf.write(filepath, file)
+# Directory mtimes only advance once per kernel tick, so a file created in the
+# same tick as a scan leaves the mtime unchanged. Listings are cached only once
+# the directory has been quiet for this long.
+JOB_FILES_SETTLE_NS = 1_000_000_000
 
-    memory_file.seek(0)
-    return send_file(
-        memory_file,
-        mimetype='application/zip',
-        as_attachment=True,
-        download_name=f'{job_id}_render.zip'
-    )
+
+def scan_job_files(job_path):
+    """List the output files of a job directory"""
+    with os.scandir(job_path) as entries:
+        return tuple(entry.name for entry in entries if not entry.name.startswith('.'))
+
+
+@functools.lru_cache(maxsize=1024)
+def cached_job_files(job_path, mtime_ns):
+    """scan_job_files() cached on the directory's mtime"""
+    return scan_job_files(job_path)
+
+
+def job_files(job_path, mtime_ns):
+    """
+    List the output files of a job directory. Cached on the directory's
+    mtime, so a job is only re-read after files are added or removed.
+    """
+    if time.time_ns() - mtime_ns < JOB_FILES_SETTLE_NS:
+        return scan_job_files(job_path)
+    return cached_job_files(job_path, mtime_ns)
 
 
 @app.route('/api/jobs', methods=['GET'])
 def list_jobs():
     """List all render jobs"""
-    jobs = []
-
-    if os.path.exists(app.config['RENDER_FOLDER']):
-        for job_id in os.listdir(app.config['RENDER_FOLDER']):
-            job_path = os.path.join(app.config['RENDER_FOLDER'], job_id)
-            if os.path.isdir(job_path):
-                files = [f for f in os.listdir(job_path) if not f.startswith('.')]
-                jobs.append({
-                    'job_id': job_id,
-                    'file_count': len(files),
-                    'files': files
-                })
-
-    return jsonify({'jobs': jobs})
+    render_folder = app.config['RENDER_FOLDER']
+
+    def generate():
+        # Encode one job at a time instead of building the whole list first
+        yield '{"jobs": ['
+        if os.path.exists(render_folder):
+            separator = ''
+            with os.scandir(render_folder) as job_entries:
+                for job_entry in job_entries:
+                    if job_entry.is_dir():
+                        try:
+                            files = job_files(job_entry.path, job_entry.stat().st_mtime_ns)
+                        except FileNotFoundError:
+                            # Job deleted mid-listing; the response is already
+                            # streaming, so an error would truncate the JSON
+                            continue
+                        yield separator + json.dumps({
+                            'job_id': job_entry.name,
+                            'file_count': len(files),
+                            'files': files
+                        })
+                        separator = ', '
+        yield ']}\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 if __name__ == '__main__':
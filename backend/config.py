@@ -4,23 +4,59 @@ import os
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
 RENDER_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rendered')
+# Keep render output in RAM (tmpfs) so frames never hit disk; lost on reboot
+RENDER_ON_TMPFS = os.environ.get('RENDER_ON_TMPFS', '').lower() in ('1', 'true')
+if RENDER_ON_TMPFS:
+    RENDER_FOLDER = os.environ.get('TMPFS_RENDER_FOLDER', '/dev/shm/blender-rendered')
 MAX_CONTENT_LENGTH = 50 * 1024 * 1024 * 1024  # 50GB max file size
 ALLOWED_EXTENSIONS = {'blend', 'zip', 'rar'}
 
+# Zero-copy downloads: let the front web server send rendered files itself.
+# USE_X_SENDFILE emits X-Sendfile (Apache/lighttpd); X_ACCEL_REDIRECT_PREFIX is
+# an nginx `internal` location aliased to RENDER_FOLDER, e.g. /protected-renders/
+USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true')
+X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX', '')
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1MB chunks for raw /api/upload_stream bodies
+PARALLEL_EXTRACT_MIN_SIZE = 256 * 1024 * 1024  # Extract ZIPs on multiple threads above 256MB uncompressed
+BSDTAR_PATH = os.environ.get('BSDTAR_PATH', 'bsdtar')  # Streams ZIP/RAR extraction during upload (libarchive-tools)
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+REDIS_POOL_LIMIT = int(os.environ.get('BROKER_POOL_LIMIT', 10))  # Pooled broker connections per process
+REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', 20))  # Cap on Redis connections per pool
+
+# Applied to every Celery app so publishing and result lookups reuse pooled
+# Redis connections instead of opening new ones under load
+CELERY_CONNECTION_SETTINGS = {
+    'broker_pool_limit': REDIS_POOL_LIMIT,
+    'broker_connection_retry_on_startup': True,
+    'broker_transport_options': {
+        'max_connections': REDIS_MAX_CONNECTIONS,
+        'socket_keepalive': True
+    },
+    'result_backend_transport_options': {
+        'max_connections': REDIS_MAX_CONNECTIONS
+    },
+    'redis_max_connections': REDIS_MAX_CONNECTIONS
+}
+
+RENDER_QUEUE = 'render_io'  # Renders only wait on Blender, served by a gevent worker (-Q render_io -P gevent)
 
 # Blender Configuration
 BLENDER_PATH = os.environ.get('BLENDER_PATH', '/home/ubuntu/blender-5.0.0-linux-x64/blender')  # Path to Blender 5.0 with CUDA support
 USE_GPU = True  # Enable NVIDIA GPU rendering
 GPU_TYPE = 'CUDA'  # CUDA or OPTIX (Using CUDA - OptiX has driver compatibility issues)
+# Keep a warm Blender process per worker slot and send it one job at a time,
+# skipping Blender startup and GPU initialisation on every render
+PERSISTENT_BLENDER = os.environ.get('PERSISTENT_BLENDER', '').lower() in ('1', 'true')
 
 # Render Configuration
 DEFAULT_SAMPLES = 64  # Reduced from 128 for faster renders (half the time!)
 DEFAULT_RESOLUTION_X = 1920
 DEFAULT_RESOLUTION_Y = 1080
 SUPPORTED_FORMATS = ['PNG', 'JPEG', 'OPEN_EXR', 'FFMPEG']  # FFMPEG for video
+PROGRESS_UPDATE_INTERVAL = 0.25  # Minimum seconds between progress writes to Redis
 
 # Create directories if they don't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
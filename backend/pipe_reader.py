@@ -0,0 +1,153 @@
+"""
+Readers for the Blender subprocess output pipe.
+
+Reads go through io_uring (python-liburing) when it is installed and the
+kernel supports it, using a registered pipe fd and a pool of registered
+buffers, otherwise through plain os.read(). Inside a gevent worker
+the pipe is read cooperatively so other renders keep running. Either way the
+pipe is drained in large chunks instead of one read per line.
+"""
+import os
+import sys
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+CHUNK_SIZE = 64 * 1024  # Bytes requested per pipe read
+RING_ENTRIES = 8
+BUFFER_COUNT = 4  # Registered io_uring read buffers, used in rotation
+
+
+def _gevent_active():
+    """True when running in a monkey-patched gevent worker (celery -P gevent)"""
+    monkey = sys.modules.get('gevent.monkey')
+    return monkey is not None and monkey.is_module_patched('os')
+
+
+def _setup_ring():
+    """Create an io_uring instance, or return None if it is unavailable"""
+    if liburing is None:
+        return None
+
+    try:
+        ring = liburing.Ring()
+        liburing.io_uring_queue_init(RING_ENTRIES, ring)
+    except Exception:
+        # Kernel too old, io_uring disabled (e.g. kernel.io_uring_disabled)
+        # or an incompatible liburing release: fall back to os.read()
+        return None
+    return ring
+
+
+def _read_chunks_os(fd, chunk_size):
+    while True:
+        chunk = os.read(fd, chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_chunks_gevent(fd, chunk_size):
+    from gevent import os as gevent_os
+
+    # Waits for the pipe on the gevent hub instead of blocking the worker
+    gevent_os.make_nonblocking(fd)
+    while True:
+        chunk = gevent_os.nb_read(fd, chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _register(ring, fd, buffers):
+    """
+    Register the pipe as fixed file 0 and pin the read buffers, so each read
+    skips the kernel's per-call file lookup and page mapping.
+    Returns False if the kernel refuses (e.g. RLIMIT_MEMLOCK too low) or the
+    installed liburing has a different API.
+    """
+    try:
+        files = liburing.FileIndex([fd])
+        iovecs = liburing.Iovec(buffers)
+        liburing.io_uring_register_files(ring, files)
+        liburing.io_uring_register_buffers(ring, iovecs)
+    except Exception:
+        return False
+    return True
+
+
+def _read_chunks_uring(ring, fd, chunk_size):
+    views = []
+    completed = False  # Set once a read has taken data from the pipe
+    try:
+        cqe = liburing.Cqe()
+        buffers = [bytearray(chunk_size) for _ in range(BUFFER_COUNT)]
+        views = [memoryview(buffer) for buffer in buffers]
+        index = 0
+        registered = _register(ring, fd, buffers)
+        while True:
+            # Pipe reads must complete in order, so keep one read in flight
+            sqe = liburing.io_uring_get_sqe(ring)
+            if registered:
+                liburing.io_uring_prep_read_fixed(sqe, 0, buffers[index], index)
+                liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_FIXED_FILE)
+            else:
+                liburing.io_uring_prep_read(sqe, fd, buffers[index])
+            liburing.io_uring_submit(ring)
+
+            # Raises OSError if the read failed
+            liburing.io_uring_wait_cqe(ring, cqe)
+            completed = True
+            result = cqe[0].res
+            liburing.io_uring_cqe_seen(ring, cqe[0])
+
+            if result == 0:
+                return
+            # Single copy out of the registered buffer
+            yield views[index][:result].tobytes()
+            index = (index + 1) % BUFFER_COUNT
+    except Exception:
+        # A liburing API mismatch surfaces on first use. Until a read has
+        # consumed pipe data, os.read() can take over without losing output.
+        if completed:
+            raise
+    finally:
+        for view in views:
+            view.release()
+        # Also drops the registered file and buffers
+        liburing.io_uring_queue_exit(ring)
+
+    yield from _read_chunks_os(fd, chunk_size)
+
+
+def read_chunks(fd, chunk_size=CHUNK_SIZE):
+    """Yield raw chunks from fd until EOF"""
+    if _gevent_active():
+        # A blocking io_uring wait would stall every greenlet in the worker
+        return _read_chunks_gevent(fd, chunk_size)
+
+    ring = _setup_ring()
+    if ring is not None:
+        return _read_chunks_uring(ring, fd, chunk_size)
+    return _read_chunks_os(fd, chunk_size)
+
+
+def read_lines(fd):
+    """
+    Yield raw byte lines (without the trailing newline) from fd until EOF.
+    Lines are split with bytes.split on whole chunks, so no text decoding or
+    per-line Python splitting happens here.
+    """
+    tail = b''
+    for chunk in read_chunks(fd):
+        # Only copy when a partial line is carried over from the last chunk
+        if tail:
+            chunk = tail + chunk
+        lines = chunk.split(b'\n')
+        tail = lines.pop()
+        yield from lines
+
+    if tail:
+        yield tail
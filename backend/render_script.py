@@ -1,20 +1,20 @@
 import bpy
 import sys
 import os
+import json
 import argparse
 import traceback
 
-def main():
-    """
-    Blender Python script to configure and execute rendering with GPU support
-    """
-    # Parse arguments after '--'
-    argv = sys.argv
-    if '--' in argv:
-        argv = argv[argv.index('--') + 1:]
-    else:
-        argv = []
+# Printed after each command in server mode; must match tasks.py
+RENDER_RESULT_MARKER = '@@RENDER_RESULT@@ '
+
+# Set once CUDA devices have been enumerated, so a warm Blender in server
+# mode does not repeat the slow device discovery for every render
+_GPU_INITIALIZED = False
+
 
+def parse_args(argv):
+    """Parse render arguments (everything after '--' on the command line)"""
     parser = argparse.ArgumentParser()
     parser.add_argument('--output', type=str, required=True)
     parser.add_argument('--format', type=str, default='PNG')
@@ -26,7 +26,15 @@ def main():
     parser.add_argument('--frame-start', type=int, default=None)
     parser.add_argument('--frame-end', type=int, default=None)
 
-    args = parser.parse_args(argv)
+    return parser.parse_args(argv)
+
+
+def render(args):
+    """
+    Configure and execute rendering with GPU support for the open blend file.
+    Returns a process-style exit code.
+    """
+    global _GPU_INITIALIZED
 
     # Get scene
     scene = bpy.context.scene
@@ -75,23 +83,26 @@ def main():
     if args.use_gpu:
         # Enable GPU rendering
         cycles_prefs = bpy.context.preferences.addons['cycles'].preferences
-        
-        # Force CUDA initialization
-        cycles_prefs.compute_device_type = 'NONE'
-        cycles_prefs.get_devices()
-        
-        # Now set to CUDA
-        cycles_prefs.compute_device_type = 'CUDA'
-        
-        # Important: Call get_devices() to refresh after changing compute_device_type
-        cycles_prefs.get_devices()
-        
-        print(f"Compute device type set to: {cycles_prefs.compute_device_type}")
-        
-        # List all available devices
-        print("Available devices after CUDA init:")
-        for device in cycles_prefs.devices:
-            print(f"  - {device.name} (Type: {device.type}, ID: {device.id})")
+
+        if not _GPU_INITIALIZED:
+            # Force CUDA initialization
+            cycles_prefs.compute_device_type = 'NONE'
+            cycles_prefs.get_devices()
+
+            # Now set to CUDA
+            cycles_prefs.compute_device_type = 'CUDA'
+
+            # Important: Call get_devices() to refresh after changing compute_device_type
+            cycles_prefs.get_devices()
+
+            print(f"Compute device type set to: {cycles_prefs.compute_device_type}")
+
+            # List all available devices
+            print("Available devices after CUDA init:")
+            for device in cycles_prefs.devices:
+                print(f"  - {device.name} (Type: {device.type}, ID: {device.id})")
+
+            _GPU_INITIALIZED = True
         
         # Enable GPU devices
         device_found = False
@@ -193,7 +204,7 @@ def main():
             print(f"Set active camera to: {cameras[0].name}")
         else:
             print("ERROR: No cameras found in scene! Cannot render.")
-            sys.exit(1)
+            return 1
 
     try:
         if args.frame_start is not None and args.frame_end is not None:
@@ -230,7 +241,50 @@ def main():
     except Exception as e:
         print(f"ERROR during rendering: {str(e)}")
         traceback.print_exc()
-        sys.exit(1)
+        return 1
+
+    return 0
+
+
+def serve():
+    """
+    Long-lived mode: read one JSON render command per line from stdin and
+    render it, so one warm Blender process can serve many jobs.
+    Each command is {"blend_file": ..., "argv": [...]}.
+    """
+    while line := sys.stdin.readline():
+        try:
+            command = json.loads(line)
+            bpy.ops.wm.open_mainfile(filepath=command['blend_file'])
+            returncode = render(parse_args(command['argv']))
+        except SystemExit as e:
+            # argparse exits on bad arguments
+            returncode = e.code if isinstance(e.code, int) and e.code else 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+
+        print(RENDER_RESULT_MARKER + json.dumps({'returncode': returncode}), flush=True)
+
+
+def main():
+    """
+    Blender Python script to configure and execute rendering with GPU support
+    """
+    # Parse arguments after '--'
+    argv = sys.argv
+    if '--' in argv:
+        argv = argv[argv.index('--') + 1:]
+    else:
+        argv = []
+
+    if '--server' in argv:
+        serve()
+        return
+
+    returncode = render(parse_args(argv))
+    if returncode:
+        sys.exit(returncode)
 
 
 if __name__ == '__main__':
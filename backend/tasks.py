@@ -1,22 +1,117 @@
 import os
+import re
+import json
 import subprocess
+import time
 from celery import Celery, current_task
+from celery.signals import worker_process_init
 import config
+import pipe_reader
 
 celery = Celery(
     'blender_render',
     broker=config.CELERY_BROKER_URL,
     backend=config.CELERY_RESULT_BACKEND
 )
+celery.conf.update(config.CELERY_CONNECTION_SETTINGS)
 
+# Matches Blender progress lines: "Fra:123 ...", "Sample 32/128" or "Saved: ..."
+_PROGRESS_RE = re.compile(rb'Fra:(\d+)|Sample (\d+)/(\d+)|Saved:')
 
-@celery.task(bind=True, name='tasks.render_blend_file')
+RENDER_SCRIPT = os.path.join(os.path.dirname(__file__), 'render_script.py')
+
+# Invariant parts of the Blender command line, built once at import
+_CMD_PREFIX = (config.BLENDER_PATH, '-b')  # Background mode
+_SCRIPT_ARGS_SUFFIX = ('--gpu-type', config.GPU_TYPE) + (('--use-gpu',) if config.USE_GPU else ())
+
+# Printed by render_script.py after each command in server mode
+RENDER_RESULT_MARKER = b'@@RENDER_RESULT@@ '
+
+# Warm Blender processes not currently rendering (PERSISTENT_BLENDER mode)
+_idle_servers = []
+
+
+class BlenderServer:
+    """
+    A long-lived Blender process running render_script.py in server mode.
+    Keeping it alive between jobs skips Blender startup and GPU/kernel
+    initialisation on every render.
+    """
+
+    def __init__(self):
+        self.returncode = None
+        self.process = subprocess.Popen(
+            _CMD_PREFIX + ('-P', RENDER_SCRIPT, '--', '--server'),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT  # Combine stderr with stdout
+        )
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def render(self, blend_file_path, script_args):
+        """
+        Send one render command and yield Blender's output lines until it
+        reports completion. Sets self.returncode and returns the process to
+        the idle pool once the command has finished.
+        """
+        self.returncode = None
+        command = {'blend_file': blend_file_path, 'argv': script_args}
+        try:
+            self.process.stdin.write(json.dumps(command).encode() + b'\n')
+            self.process.stdin.flush()
+
+            for raw_line in pipe_reader.read_lines(self.process.stdout.fileno()):
+                if raw_line.startswith(RENDER_RESULT_MARKER):
+                    result = json.loads(raw_line[len(RENDER_RESULT_MARKER):])
+                    self.returncode = result['returncode']
+                    return
+                yield raw_line
+
+            # Blender exited before finishing the command
+            self.returncode = self.process.wait()
+        finally:
+            if self.returncode is None:
+                # Abandoned mid-render, its state is unknown
+                self.process.kill()
+                self.process.wait()
+            elif self.alive():
+                _idle_servers.append(self)
+
+
+def acquire_blender_server():
+    """Return an idle warm Blender process, starting one if none is available"""
+    while _idle_servers:
+        server = _idle_servers.pop()
+        if server.alive():
+            return server
+    return BlenderServer()
+
+
+def silent_unlink(path):
+    """Remove a file if it exists, in one syscall and without a stat race"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+@worker_process_init.connect
+def start_blender_server(**kwargs):
+    """Start a warm Blender process as each prefork worker child starts"""
+    if config.PERSISTENT_BLENDER:
+        _idle_servers.append(BlenderServer())
+
+
+@celery.task(bind=True, name='tasks.render_blend_file', queue=config.RENDER_QUEUE)
 def render_blend_file(self, blend_file_path, job_id, output_format,
                       samples=None, resolution_x=None, resolution_y=None,
                       frame_start=None, frame_end=None):
     """
     Celery task to render a Blender file
     """
+    server = None
     try:
         # Update task state to PROGRESS
         self.update_state(state='PROGRESS', meta={'status': 'Starting render...', 'progress': 0})
@@ -48,116 +143,130 @@ def render_blend_file(self, blend_file_path, job_id, output_format,
             # Single file for stills or video
             output_path = os.path.join(output_dir, f'render.{file_ext}')
 
-        # Build Blender command
-        render_script = os.path.join(os.path.dirname(__file__), 'render_script.py')
+        # Build render_script.py arguments
+        frame_args = ()
+
+        if frame_start is not None:
+            frame_args += ('--frame-start', str(frame_start))
+
+        if frame_end is not None:
+            frame_args += ('--frame-end', str(frame_end))
 
-        cmd = [
-            config.BLENDER_PATH,
-            '-b',  # Background mode
-            blend_file_path,
-            '-P', render_script,  # Run Python script
-            '--',
+        script_args = (
             '--output', output_path,
             '--format', output_format,
             '--samples', str(samples),
             '--resolution-x', str(resolution_x),
-            '--resolution-y', str(resolution_y),
-            '--gpu-type', config.GPU_TYPE
-        ]
-
-        if config.USE_GPU:
-            cmd.extend(['--use-gpu'])
-
-        if frame_start is not None:
-            cmd.extend(['--frame-start', str(frame_start)])
-
-        if frame_end is not None:
-            cmd.extend(['--frame-end', str(frame_end)])
+            '--resolution-y', str(resolution_y)
+        ) + _SCRIPT_ARGS_SUFFIX + frame_args
 
         # Execute Blender render
         self.update_state(state='PROGRESS', meta={'status': 'Rendering...', 'progress': 10})
 
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,  # Combine stderr with stdout
-            universal_newlines=True
-        )
+        if config.PERSISTENT_BLENDER:
+            server = acquire_blender_server()
+            output = server.render(blend_file_path, script_args)
+        else:
+            # Run render_script.py on the blend file
+            cmd = _CMD_PREFIX + (blend_file_path, '-P', RENDER_SCRIPT, '--') + script_args
+
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT  # Combine stderr with stdout
+            )
+            output = pipe_reader.read_lines(process.stdout.fileno())
 
         # Monitor progress
         output_lines = []
         total_frames = (frame_end - frame_start + 1) if frame_end and frame_start else 1
-        import time
         start_time = time.time()
         frame_times = []
-        
-        for line in process.stdout:
-            print(line.strip())  # Log output
-            output_lines.append(line.strip())
+        last_update = 0.0
+        pending_meta = None
+
+        for raw_line in output:
+            line = raw_line.decode(errors='replace').strip()
+            print(line)  # Log output
+            output_lines.append(line)
 
             # Parse Blender output for detailed progress
-            if 'Fra:' in line:  # Frame rendering indicator
+            match = _PROGRESS_RE.search(raw_line)
+            if not match:
+                continue
+
+            meta = None
+
+            if match.group(1) is not None:  # Frame rendering indicator
                 # Extract frame number from output like "Fra:123 Mem:..."
-                try:
-                    import re
-                    frame_match = re.search(r'Fra:(\d+)', line)
-                    if frame_match:
-                        current_frame = int(frame_match.group(1))
-                        if frame_start:
-                            frames_done = current_frame - frame_start + 1
-                            progress = min(int((frames_done / total_frames) * 90), 90)
-                            
-                            # Calculate ETA for animations
-                            eta_text = ""
-                            if frames_done > 0:
-                                elapsed = time.time() - start_time
-                                avg_time_per_frame = elapsed / frames_done
-                                remaining_frames = total_frames - frames_done
-                                eta_seconds = remaining_frames * avg_time_per_frame
-                                
-                                if eta_seconds > 60:
-                                    eta_minutes = int(eta_seconds / 60)
-                                    eta_text = f" - ETA: {eta_minutes}m {int(eta_seconds % 60)}s"
-                                else:
-                                    eta_text = f" - ETA: {int(eta_seconds)}s"
-                            
-                            self.update_state(state='PROGRESS', meta={
-                                'status': f'Rendering frame {current_frame}/{frame_end or current_frame}{eta_text}',
-                                'progress': progress,
-                                'current_frame': current_frame,
-                                'total_frames': frame_end or current_frame
-                            })
+                current_frame = int(match.group(1))
+                if frame_start:
+                    frames_done = current_frame - frame_start + 1
+                    progress = min(int((frames_done / total_frames) * 90), 90)
+
+                    # Calculate ETA for animations
+                    eta_text = ""
+                    if frames_done > 0:
+                        elapsed = time.time() - start_time
+                        avg_time_per_frame = elapsed / frames_done
+                        remaining_frames = total_frames - frames_done
+                        eta_seconds = remaining_frames * avg_time_per_frame
+
+                        if eta_seconds > 60:
+                            eta_minutes = int(eta_seconds / 60)
+                            eta_text = f" - ETA: {eta_minutes}m {int(eta_seconds % 60)}s"
                         else:
-                            self.update_state(state='PROGRESS', meta={'status': f'Rendering...', 'progress': 50})
-                except:
-                    pass
-            elif 'Saved:' in line:  # File saved indicator
-                self.update_state(state='PROGRESS', meta={'status': 'Finalizing...', 'progress': 95})
-            elif 'Sample' in line and '/' in line:  # Sample progress for single frame
+                            eta_text = f" - ETA: {int(eta_seconds)}s"
+
+                    meta = {
+                        'status': f'Rendering frame {current_frame}/{frame_end or current_frame}{eta_text}',
+                        'progress': progress,
+                        'current_frame': current_frame,
+                        'total_frames': frame_end or current_frame
+                    }
+                else:
+                    meta = {'status': f'Rendering...', 'progress': 50}
+            elif match.group(2) is not None:  # Sample progress for single frame
                 # Parse "Sample 32/128" type messages
-                try:
-                    import re
-                    sample_match = re.search(r'Sample (\d+)/(\d+)', line)
-                    if sample_match and not frame_end:  # Only for single frames
-                        current_sample = int(sample_match.group(1))
-                        total_samples = int(sample_match.group(2))
-                        progress = int((current_sample / total_samples) * 90)
-                        self.update_state(state='PROGRESS', meta={
-                            'status': f'Sampling {current_sample}/{total_samples}',
-                            'progress': progress
-                        })
-                except:
-                    pass
-
-        process.wait()
-
-        if process.returncode != 0:
+                current_sample = int(match.group(2))
+                total_samples = int(match.group(3))
+                if total_samples and not frame_end:  # Only for single frames
+                    progress = int((current_sample / total_samples) * 90)
+                    meta = {
+                        'status': f'Sampling {current_sample}/{total_samples}',
+                        'progress': progress
+                    }
+            else:  # File saved indicator
+                meta = {'status': 'Finalizing...', 'progress': 95}
+
+            if meta is None:
+                continue
+
+            # Coalesce progress writes to the result backend
+            now = time.monotonic()
+            if now - last_update >= config.PROGRESS_UPDATE_INTERVAL:
+                self.update_state(state='PROGRESS', meta=meta)
+                last_update = now
+                pending_meta = None
+            else:
+                pending_meta = meta
+
+        if server:
+            returncode = server.returncode
+        else:
+            process.wait()
+            returncode = process.returncode
+
+        # Publish the latest progress that was held back by the throttle
+        if pending_meta:
+            self.update_state(state='PROGRESS', meta=pending_meta)
+
+        if returncode != 0:
             full_output = '\n'.join(output_lines)
-            raise Exception(f'Blender render failed with code {process.returncode}:\n{full_output}')
+            raise Exception(f'Blender render failed with code {returncode}:\n{full_output}')
 
         # Clean up uploaded file
-        if os.path.exists(blend_file_path):
-            os.remove(blend_file_path)
+        silent_unlink(blend_file_path)
 
         # Get output files
         output_files = [f for f in os.listdir(output_dir) if not f.startswith('.')]
@@ -170,8 +279,11 @@ def render_blend_file(self, blend_file_path, job_id, output_format,
         }
 
     except Exception as e:
+        # Stop a warm Blender that was left mid-render
+        if server:
+            output.close()
+
         # Clean up on error
-        if os.path.exists(blend_file_path):
-            os.remove(blend_file_path)
+        silent_unlink(blend_file_path)
 
         raise e
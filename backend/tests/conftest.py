@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Backend modules import each other as top-level modules (e.g. `import config`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,202 @@
+import io
+import os
+import shutil
+import stat
+import subprocess
+import tarfile
+import tempfile
+import zipfile
+
+import pytest
+from werkzeug.exceptions import ClientDisconnected
+
+import app
+import config
+
+
+class DisconnectingStream:
+    """Request body that fails part way through, like a client disconnect"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def read(self, size):
+        if not self.data:
+            raise ClientDisconnected()
+        chunk, self.data = self.data[:size], b''
+        return chunk
+
+
+def test_upload_stream_removes_partial_file(tmp_path, monkeypatch):
+    """A body that fails part way through leaves nothing in the upload folder"""
+    monkeypatch.setitem(app.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+
+    response = app.app.test_client().post(
+        '/api/upload_stream?filename=scene.blend', data=b'blend' * 200,
+        environ_overrides={'wsgi.input': DisconnectingStream(b'blend' * 60)})
+
+    assert response.status_code == 400
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.skipif(not shutil.which(config.BSDTAR_PATH), reason='bsdtar not installed')
+def test_stream_extract_client_disconnect(tmp_path, monkeypatch):
+    """bsdtar is stopped and the partial extraction removed"""
+    monkeypatch.setitem(app.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    processes = []
+    real_popen = subprocess.Popen
+
+    def popen(*args, **kwargs):
+        processes.append(real_popen(*args, **kwargs))
+        return processes[-1]
+
+    monkeypatch.setattr(app.subprocess, 'Popen', popen)
+
+    archive = tmp_path / 'scene.zip'
+    with zipfile.ZipFile(archive, 'w') as zip_ref:
+        zip_ref.writestr('scene.blend', os.urandom(64 * 1024))
+
+    with pytest.raises(ClientDisconnected):
+        app.stream_extract(DisconnectingStream(archive.read_bytes()[:1024]), 'job')
+
+    assert processes[0].returncode is not None
+    assert not (tmp_path / 'job_extracted').exists()
+
+
+@pytest.mark.skipif(not shutil.which(config.BSDTAR_PATH), reason='bsdtar not installed')
+def test_stream_extract_drops_links_and_modes(tmp_path, monkeypatch):
+    """Archive symlinks, devices and setuid bits never reach the render"""
+    monkeypatch.setitem(app.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w') as tar:
+        link = tarfile.TarInfo('scene.blend')
+        link.type = tarfile.SYMTYPE
+        link.linkname = '/etc/hostname'
+        tar.addfile(link)
+        fifo = tarfile.TarInfo('textures/wood.png')
+        fifo.type = tarfile.FIFOTYPE
+        tar.addfile(fifo)
+        data = b'blend'
+        member = tarfile.TarInfo('real/scene.blend')
+        member.size = len(data)
+        member.mode = 0o4755
+        tar.addfile(member, io.BytesIO(data))
+
+    with app.app.test_request_context():
+        blend_filepath, error = app.stream_extract(io.BytesIO(archive.getvalue()), 'job')
+
+    extract_dir = tmp_path / 'job_extracted'
+    assert error is None
+    assert blend_filepath == str(extract_dir / 'real' / 'scene.blend')
+    assert not os.stat(blend_filepath).st_mode & stat.S_ISUID
+    assert not os.path.lexists(extract_dir / 'scene.blend')
+    assert not os.path.lexists(extract_dir / 'textures' / 'wood.png')
+
+
+def test_celery_conf_loads():
+    """Reading the conf finalizes it, which fails if old and new keys are mixed"""
+    conf = app.celery.conf
+    assert conf.broker_pool_limit == config.REDIS_POOL_LIMIT
+    assert conf.broker_transport_options['max_connections'] == config.REDIS_MAX_CONNECTIONS
+    assert conf.result_backend == config.CELERY_RESULT_BACKEND
+
+
+def test_job_files_not_cached_while_directory_is_fresh(tmp_path):
+    """A file added in the same mtime tick as a scan still shows up"""
+    job_path = tmp_path / 'job'
+    job_path.mkdir()
+    (job_path / 'frame_0001.png').write_bytes(b'png')
+    mtime_ns = job_path.stat().st_mtime_ns
+
+    assert app.job_files(str(job_path), mtime_ns) == ('frame_0001.png',)
+    (job_path / 'frame_0002.png').write_bytes(b'png')
+    assert sorted(app.job_files(str(job_path), mtime_ns)) == ['frame_0001.png', 'frame_0002.png']
+
+
+def test_job_files_cached_once_settled(tmp_path):
+    job_path = tmp_path / 'job'
+    job_path.mkdir()
+    (job_path / 'frame_0001.png').write_bytes(b'png')
+    mtime_ns = job_path.stat().st_mtime_ns - app.JOB_FILES_SETTLE_NS
+
+    assert app.job_files(str(job_path), mtime_ns) == ('frame_0001.png',)
+    (job_path / 'frame_0002.png').write_bytes(b'png')
+    assert app.job_files(str(job_path), mtime_ns) == ('frame_0001.png',)
+
+
+def test_list_jobs_skips_deleted_job(tmp_path, monkeypatch):
+    """A job removed while the listing streams is left out, not a broken response"""
+    monkeypatch.setitem(app.app.config, 'RENDER_FOLDER', str(tmp_path))
+    for job_id in ('kept', 'deleted'):
+        (tmp_path / job_id).mkdir()
+        (tmp_path / job_id / 'frame_0001.png').write_bytes(b'png')
+
+    job_files = app.job_files
+
+    def deleting_job_files(job_path, mtime_ns):
+        if job_path.endswith('deleted'):
+            shutil.rmtree(job_path)
+        return job_files(job_path, mtime_ns)
+
+    monkeypatch.setattr(app, 'job_files', deleting_job_files)
+
+    response = app.app.test_client().get('/api/jobs')
+
+    assert response.get_json() == {
+        'jobs': [{'job_id': 'kept', 'file_count': 1, 'files': ['frame_0001.png']}]
+    }
+
+
+def test_copy_file_keeps_spooled_source_in_memory(tmp_path):
+    """A small upload must not be rolled over to disk just to copy it"""
+    src = tempfile.SpooledTemporaryFile(max_size=1024)
+    src.write(b'blend' * 10)
+    src.seek(0)
+
+    with open(tmp_path / 'out.blend', 'wb') as dst:
+        app.copy_file(src, dst)
+
+    assert not src._rolled
+    assert (tmp_path / 'out.blend').read_bytes() == b'blend' * 10
+
+
+def test_extract_zip_parallel(tmp_path, monkeypatch):
+    """Workers share parent directories, which must not race on creation"""
+    monkeypatch.setattr(config, 'PARALLEL_EXTRACT_MIN_SIZE', 0)
+    monkeypatch.setattr(app.os, 'cpu_count', lambda: 8)
+
+    archive = tmp_path / 'scene.zip'
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr('project/empty/', '')
+        for i in range(200):
+            zip_ref.writestr(f'project/textures/set{i % 4}/tex{i}.png', f'data{i}' * 100)
+        zip_ref.writestr('../escape.txt', 'outside')
+
+    extract_dir = tmp_path / 'out'
+    app.extract_zip(str(archive), str(extract_dir))
+
+    assert (extract_dir / 'project' / 'empty').is_dir()
+    for i in range(200):
+        member = extract_dir / 'project' / 'textures' / f'set{i % 4}' / f'tex{i}.png'
+        assert member.read_text() == f'data{i}' * 100
+    assert (extract_dir / 'escape.txt').read_text() == 'outside'
+    assert not (tmp_path / 'escape.txt').exists()
+
+
+@pytest.mark.parametrize('use_x_sendfile', [False, True])
+def test_download_drops_cache_only_when_flask_sends(tmp_path, monkeypatch, use_x_sendfile):
+    """With X-Sendfile the front-end server reads the file after Flask is done"""
+    monkeypatch.setitem(app.app.config, 'RENDER_FOLDER', str(tmp_path))
+    monkeypatch.setitem(app.app.config, 'USE_X_SENDFILE', use_x_sendfile)
+    monkeypatch.setitem(app.app.config, 'X_ACCEL_REDIRECT_PREFIX', '')
+    dropped = []
+    monkeypatch.setattr(app, 'drop_file_cache', dropped.append)
+    (tmp_path / 'job').mkdir()
+    (tmp_path / 'job' / 'frame_0001.png').write_bytes(b'png')
+
+    response = app.app.test_client().get('/api/download/job')
+    response.close()
+
+    assert response.status_code == 200
+    assert bool(dropped) != use_x_sendfile
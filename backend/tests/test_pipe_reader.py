@@ -0,0 +1,55 @@
+import os
+import types
+
+import pytest
+
+import pipe_reader
+
+OUTPUT = b'Fra:1 Sample 1/128\nFra:1 Sample 2/128\nSaved: frame_0001.png'
+
+
+def read_output(data):
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, data)
+    os.close(write_fd)
+    try:
+        return b''.join(pipe_reader.read_chunks(read_fd))
+    finally:
+        os.close(read_fd)
+
+
+def test_read_chunks_os(monkeypatch):
+    monkeypatch.setattr(pipe_reader, 'liburing', None)
+    assert read_output(OUTPUT) == OUTPUT
+
+
+def test_read_chunks_uring():
+    pytest.importorskip('liburing')
+    assert read_output(OUTPUT) == OUTPUT
+
+
+def test_liburing_api_mismatch_falls_back(monkeypatch):
+    """A liburing without the expected read API degrades to os.read()"""
+    liburing = types.SimpleNamespace(
+        Ring=object,
+        io_uring_queue_init=lambda entries, ring: None,
+        io_uring_queue_exit=lambda ring: None,
+    )
+    monkeypatch.setattr(pipe_reader, 'liburing', liburing)
+    assert read_output(OUTPUT) == OUTPUT
+
+
+def test_register_api_mismatch_reads_unregistered(monkeypatch):
+    """A liburing that cannot register files still reads through io_uring"""
+    liburing = pytest.importorskip('liburing')
+    ring = pipe_reader._setup_ring()
+    if ring is None:
+        pytest.skip('io_uring unavailable')
+    liburing.io_uring_queue_exit(ring)
+
+    def file_index(fds):
+        raise TypeError('FileIndex() takes no arguments')
+
+    monkeypatch.setattr(liburing, 'FileIndex', file_index)
+    monkeypatch.setattr(pipe_reader, '_read_chunks_os', None)
+    assert read_output(OUTPUT) == OUTPUT
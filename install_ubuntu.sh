@@ -236,6 +236,11 @@ print_status "Installing unrar..."
 sudo apt install -y unrar
 print_success "unrar installed"
 
+# bsdtar lets /api/upload_stream extract archives while they upload
+print_status "Installing bsdtar..."
+sudo apt install -y libarchive-tools
+print_success "bsdtar installed"
+
 #####################################################################
 # Setup Python Virtual Environment
 #####################################################################
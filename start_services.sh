@@ -71,7 +71,10 @@ echo "Starting Celery worker..."
 cd backend
 
 # Build Celery command (add --uid if not running as root)
-CELERY_CMD="celery -A tasks worker --loglevel=info --concurrency=2"
+# Render tasks only wait on Blender, so they run on a gevent pool consuming
+# the render_io queue. Concurrency is the number of simultaneous renders.
+RENDER_CONCURRENCY=${RENDER_CONCURRENCY:-2}
+CELERY_CMD="celery -A tasks worker --loglevel=info -Q render_io -P gevent --concurrency=$RENDER_CONCURRENCY"
 if [ "$EUID" -eq 0 ]; then
     echo -e "${YELLOW}Note: Running Celery as root. Consider using --uid option in production.${NC}"
 fi